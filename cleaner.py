@@ -1,5 +1,6 @@
 import pandas as pd
 import re
+from instrumentation import pipeline_run, stage
 
 def clean_phone_number(phone):
     # Strip all non-numeric characters
@@ -26,26 +27,36 @@ def validate_email(email):
 def main():
     # Load the messy data
     try:
-        df = pd.read_csv('messy_leads.csv')
+        with stage("load_csv", unit="rows") as s:
+            df = pd.read_csv('messy_leads.csv')
+            s.add(len(df))
         print("Messy data loaded successfully.")
     except FileNotFoundError:
         print("Error: messy_leads.csv not found. Please ensure the file exists.")
         return
 
     # 1. Clean Names: Convert Full_Name to Title Case
-    df['Full_Name'] = df['Full_Name'].str.title()
+    with stage("clean_names", unit="rows") as s:
+        df['Full_Name'] = df['Full_Name'].str.title()
+        s.add(len(df))
     print("Full_Name column cleaned to Title Case.")
 
     # 2. Standardize Phones: Strip non-numeric and format or mark as INVALID
-    df['Phone_Number'] = df['Phone_Number'].apply(clean_phone_number)
+    with stage("standardize_phones", unit="rows") as s:
+        df['Phone_Number'] = df['Phone_Number'].apply(clean_phone_number)
+        s.add(len(df))
     print("Phone_Number column standardized.")
 
     # 3. Parse Dates: Standardize Signup_Date to YYYY-MM-DD, coerce errors to NaT
-    df['Signup_Date'] = pd.to_datetime(df['Signup_Date'], errors='coerce').dt.strftime('%Y-%m-%d')
+    with stage("parse_dates", unit="rows") as s:
+        df['Signup_Date'] = pd.to_datetime(df['Signup_Date'], errors='coerce').dt.strftime('%Y-%m-%d')
+        s.add(len(df))
     print("Signup_Date column parsed and standardized.")
 
     # 4. Validate Emails: Create a boolean column for valid emails
-    df['is_valid_email'] = df['Email'].apply(validate_email)
+    with stage("validate_emails", unit="rows") as s:
+        df['is_valid_email'] = df['Email'].apply(validate_email)
+        s.add(len(df))
     print("Email column validated.")
 
     # Identify rows with any invalid data (invalid email, invalid phone, or NaT date)
@@ -62,15 +73,20 @@ def main():
     clean_df = clean_df.drop(columns=['is_valid_email'])
 
     # Save the cleaned data
-    clean_df.to_csv('clean_data.csv', index=False)
+    with stage("write_clean_csv", unit="rows") as s:
+        clean_df.to_csv('clean_data.csv', index=False)
+        s.add(len(clean_df))
     print(f"Clean data saved to clean_data.csv ({len(clean_df)} rows).")
 
     # Save the error log
     # For the error log, it's useful to keep `is_valid_email` to see why it was invalid
-    error_df.to_csv('error_log.csv', index=False)
+    with stage("write_error_log", unit="rows") as s:
+        error_df.to_csv('error_log.csv', index=False)
+        s.add(len(error_df))
     print(f"Error log saved to error_log.csv ({len(error_df)} rows).")
 
     print("Data cleaning process completed!")
 
 if __name__ == "__main__":
-    main()
+    with pipeline_run("cleaner"):
+        main()
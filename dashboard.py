@@ -1,22 +1,29 @@
 
 import streamlit as st
-import pandas as pd
-import sqlalchemy
 import os
-import altair as alt
 import io
+# pandas, sqlalchemy, altair and openpyxl are imported inside the functions that
+# use them, so the sidebar renders without waiting on them and each page only
+# loads what it needs.
+from instrumentation import pipeline_run, stage
 
 # --- Configuration --- #
 BASE_DIR = r"C:\Users\ryano\My Drive\Be Bob\Ai projects\Code Puppy\retail-pulse-dashboard\src"
-DATABASE_PATH = os.path.join(BASE_DIR, "retail.db")
+# RETAIL_DB_PATH points the dashboard at another database (e.g. for benchmarks)
+DATABASE_PATH = os.environ.get("RETAIL_DB_PATH", os.path.join(BASE_DIR, "retail.db"))
+# Per-rerun metrics are opt-in; the PIPELINE_* settings are meant for the batch scripts
+METRICS_ENABLED = os.environ.get("DASHBOARD_METRICS") == "1"
 
 # --- Database Connection --- #
 @st.cache_resource
 def get_db_connection():
     """
     Establishes and caches a SQLAlchemy engine connection to the SQLite database.
-    The connection is cached to prevent re-initializing it on every rerun of the script.
+    The connection is cached to prevent re-initializing it on every rerun of the script,
+    and is only created the first time a page needs the database.
     """
+    import sqlalchemy
+
     print(f"Attempting to connect to database: {DATABASE_PATH}") # For debugging
     engine = sqlalchemy.create_engine(f"sqlite:///{DATABASE_PATH}", connect_args={"check_same_thread": False})
     try:
@@ -30,8 +37,6 @@ def get_db_connection():
         st.stop()
     return engine
 
-engine = get_db_connection()
-
 # --- SQL Queries --- #
 # Zero Sales Alert query (reused from etl_pipeline.py)
 ZERO_SALES_ALERT_QUERY = """
@@ -81,13 +86,31 @@ ORDER BY
 LIMIT 5;
 """
 
+# --- Export Helpers --- #
+@st.cache_data(max_entries=4)
+def to_excel_bytes(df):
+    """
+    Renders a DataFrame as an .xlsx file. Cached so the workbook is only rebuilt
+    when the data changes, and openpyxl is only loaded on the Risk Alerts page.
+    The data changes daily, so only the few most recent workbooks are kept.
+    """
+    excel_buffer = io.BytesIO()
+    df.to_excel(excel_buffer, index=False, engine='openpyxl')
+    return excel_buffer.getvalue()
+
 # --- Dashboard Pages --- #
 def executive_overview_page():
+    import pandas as pd
+    import altair as alt
+
     st.title("Executive Overview")
+    engine = get_db_connection()
 
     st.header("Total Units Sold per Day (Last 60 Days)")
     try:
-        df_units_sold = pd.read_sql(TOTAL_UNITS_SOLD_LAST_60_DAYS_QUERY, engine)
+        with stage("query_units_sold", unit="rows") as s:
+            df_units_sold = pd.read_sql(TOTAL_UNITS_SOLD_LAST_60_DAYS_QUERY, engine)
+            s.add(len(df_units_sold))
         df_units_sold['date'] = pd.to_datetime(df_units_sold['date'])
         if not df_units_sold.empty:
             chart = alt.Chart(df_units_sold).mark_line().encode(
@@ -104,7 +127,9 @@ def executive_overview_page():
 
     st.header("Top 5 Stores by Revenue")
     try:
-        df_top_stores = pd.read_sql(TOP_5_STORES_BY_REVENUE_QUERY, engine)
+        with stage("query_top_stores", unit="rows") as s:
+            df_top_stores = pd.read_sql(TOP_5_STORES_BY_REVENUE_QUERY, engine)
+            s.add(len(df_top_stores))
         if not df_top_stores.empty:
             chart = alt.Chart(df_top_stores).mark_bar().encode(
                 x=alt.X('store_id:N', title='Store ID', sort='-y'),
@@ -119,21 +144,26 @@ def executive_overview_page():
         st.error(f"Error loading top stores by revenue data: {e}")
 
 def risk_alerts_page():
+    import pandas as pd
+
     st.title("Risk Alerts (The Analyst Tool)")
+    engine = get_db_connection()
 
     st.header("Zero Sales Alert: Products with Inventory > 10 and 0 Sales in Last 7 Days")
     try:
-        df_zero_sales = pd.read_sql(ZERO_SALES_ALERT_QUERY, engine)
+        with stage("query_zero_sales", unit="rows") as s:
+            df_zero_sales = pd.read_sql(ZERO_SALES_ALERT_QUERY, engine)
+            s.add(len(df_zero_sales))
         if not df_zero_sales.empty:
             st.dataframe(df_zero_sales, use_container_width=True)
 
             # Export to Excel button
-            excel_buffer = io.BytesIO()
-            df_zero_sales.to_excel(excel_buffer, index=False, engine='openpyxl')
-            excel_buffer.seek(0)
+            with stage("export_excel", unit="rows") as s:
+                excel_bytes = to_excel_bytes(df_zero_sales)
+                s.add(len(df_zero_sales))
             st.download_button(
                 label="Export to Excel",
-                data=excel_buffer,
+                data=excel_bytes,
                 file_name="zero_sales_alert.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
@@ -143,6 +173,9 @@ def risk_alerts_page():
         st.error(f"Error loading zero sales alerts: {e}")
 
 def scenario_planner_page():
+    import pandas as pd
+    import altair as alt
+
     st.title("Scenario Planner")
     st.markdown("Use the sliders below to simulate the impact of promotions on revenue.")
 
@@ -174,8 +207,11 @@ def scenario_planner_page():
     WHERE
         date >= DATE('now', '-30 days');
     """
+    engine = get_db_connection()
     try:
-        df_baseline = pd.read_sql(baseline_query, engine)
+        with stage("query_baseline", unit="rows") as s:
+            df_baseline = pd.read_sql(baseline_query, engine)
+            s.add(len(df_baseline))
         current_revenue = df_baseline['current_revenue'].iloc[0] if not df_baseline.empty and not pd.isna(df_baseline['current_revenue'].iloc[0]) else 0.0
         current_volume = df_baseline['current_volume'].iloc[0] if not df_baseline.empty and not pd.isna(df_baseline['current_volume'].iloc[0]) else 0.0
 
@@ -233,9 +269,15 @@ def scenario_planner_page():
 st.sidebar.title("Navigation")
 selection = st.sidebar.radio("Go to", ["Executive Overview", "Risk Alerts", "Scenario Planner"])
 
-if selection == "Executive Overview":
-    executive_overview_page()
-elif selection == "Risk Alerts":
-    risk_alerts_page()
-elif selection == "Scenario Planner":
-    scenario_planner_page()
+# With DASHBOARD_METRICS=1 every Streamlit rerun is reported as its own run,
+# one stage per page render
+with pipeline_run("dashboard", enabled=METRICS_ENABLED):
+    if selection == "Executive Overview":
+        with stage("render_executive_overview"):
+            executive_overview_page()
+    elif selection == "Risk Alerts":
+        with stage("render_risk_alerts"):
+            risk_alerts_page()
+    elif selection == "Scenario Planner":
+        with stage("render_scenario_planner"):
+            scenario_planner_page()
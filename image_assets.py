@@ -0,0 +1,119 @@
+import io
+import os
+import tempfile
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+# --- Configuration --- #
+CACHE_DIR = os.path.join("images", ".cache")
+
+
+def _variant_prefix(source_path, width):
+    base_name = os.path.splitext(os.path.basename(source_path))[0]
+    return f"{base_name}_{width}w_"
+
+
+def _variant_path(source_path, width, mtime_ns):
+    return os.path.join(CACHE_DIR, f"{_variant_prefix(source_path, width)}{mtime_ns}.png")
+
+
+def _encode(img):
+    # PNG (like JPEG) is passed through st.image untouched; other formats such
+    # as WebP would be decoded and re-encoded to PNG on every rerun
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _write_variant(source_path, width, variant_path, data):
+    """
+    Writes a variant to the disk cache and removes variants left over from older
+    versions of the same source. Failures (e.g. a read-only deploy) are ignored,
+    the variant then simply lives in memory only.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write via a temp file so a concurrent session never reads a partial image
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates owner-only files
+        os.replace(tmp_path, variant_path)
+    except OSError as e:
+        print(f"Could not cache image variant '{variant_path}': {e}")
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return
+
+    prefix = _variant_prefix(source_path, width)
+    for filename in os.listdir(CACHE_DIR):
+        stale_path = os.path.join(CACHE_DIR, filename)
+        if filename.startswith(prefix) and stale_path != variant_path:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
+
+def _build_variant(source_path, width, mtime_ns):
+    """
+    Resizes the source image to the display width and stores it in the disk cache.
+    """
+    with Image.open(source_path) as img:
+        img.load()
+        # Never upscale, only shrink images wider than the display width
+        if img.width > width:
+            height = round(img.height * width / img.width)
+            img = img.resize((width, height), Image.LANCZOS)
+        data = _encode(img)
+
+    _write_variant(source_path, width, _variant_path(source_path, width, mtime_ns), data)
+    return data
+
+
+@lru_cache(maxsize=32)
+def _load_variant(source_path, width, mtime_ns):
+    """
+    In-memory LRU of encoded display variants. The source mtime is part of the
+    key, so editing an image naturally invalidates its entry.
+    """
+    try:
+        with open(_variant_path(source_path, width, mtime_ns), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return _build_variant(source_path, width, mtime_ns)
+
+
+def get_display_image(source_path, width):
+    """
+    Returns the encoded bytes of source_path resized to the given display width,
+    ready to pass to st.image, or None if the source image does not exist.
+    """
+    try:
+        mtime_ns = os.stat(source_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_variant(source_path, width, mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def placeholder_image(width, height, text):
+    """
+    Generates a plain placeholder image with centred text, so missing images
+    don't depend on a remote placeholder service.
+    """
+    img = Image.new("RGB", (width, height), "#e9ecef")
+    draw = ImageDraw.Draw(img)
+    try:
+        font = ImageFont.load_default(size=max(12, height // 12))
+    except TypeError:  # Pillow < 10.1 only has a fixed-size default font
+        font = ImageFont.load_default()
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    position = ((width - (right - left)) / 2 - left, (height - (bottom - top)) / 2 - top)
+    draw.text(position, text, fill="#6c757d", font=font)
+    return _encode(img)
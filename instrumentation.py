@@ -0,0 +1,292 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# --- Configuration --- #
+# All settings come from environment variables so the nightly jobs can turn
+# metrics on without touching the scripts themselves.
+#   PIPELINE_METRICS_FORMAT  "json" (default), "prometheus" or "off"
+#   PIPELINE_METRICS_OUTPUT  File to write to. JSON lines are appended; a
+#                            Prometheus textfile is rewritten at the end of
+#                            the run (a directory gets "<script>.prom").
+#                            Defaults to stderr for JSON.
+#   PIPELINE_PROFILE         If set, run the script under cProfile and dump
+#                            the stats to this path (open with pstats/snakeviz).
+#                            Works independently of the metrics format.
+# Peak RSS comes from the resource module on Linux/macOS and from the Win32
+# GetProcessMemoryInfo call (via ctypes) on Windows; no extra packages needed.
+METRICS_FORMAT = os.environ.get("PIPELINE_METRICS_FORMAT", "json").lower()
+METRICS_OUTPUT = os.environ.get("PIPELINE_METRICS_OUTPUT")
+PROFILE_OUTPUT = os.environ.get("PIPELINE_PROFILE")
+METRICS_FORMATS = ("json", "prometheus", "off")
+
+# A context variable rather than a global: Streamlit runs each session's script
+# in its own thread, and each thread must only see its own run
+_active_run = ContextVar("active_pipeline_run", default=None)
+
+
+def _windows_peak_working_set():
+    """
+    Returns PeakWorkingSetSize from GetProcessMemoryInfo, Windows' equivalent
+    of peak RSS, or None if the call fails.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+    get_current_process.restype = wintypes.HANDLE
+    get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+    get_process_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+    get_process_memory_info.restype = wintypes.BOOL
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    if not get_process_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def peak_rss_bytes():
+    """
+    Returns the peak resident set size of this process in bytes,
+    or None if it cannot be determined on this platform.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS reports bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    if sys.platform == "win32":
+        return _windows_peak_working_set()
+    return None
+
+
+class Stage:
+    """
+    Timing and item counter for a single named stage of a script.
+    Call add() for every row/file/URL handled so throughput can be reported.
+    """
+
+    def __init__(self, name, unit=None):
+        self.name = name
+        self.unit = unit
+        self.count = 0
+        self.seconds = 0.0
+        self._start = None
+
+    def add(self, n=1):
+        self.count += n
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self._start
+
+    @property
+    def rate(self):
+        if self.unit is None or self.seconds <= 0:
+            return None
+        return self.count / self.seconds
+
+    def to_record(self):
+        return {
+            "stage": self.name,
+            "seconds": round(self.seconds, 6),
+            "unit": self.unit,
+            "count": self.count if self.unit else None,
+            "per_second": round(self.rate, 3) if self.rate is not None else None,
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+
+class PipelineRun:
+    """
+    Collects the stages of one script run and emits them as JSON lines
+    (one per stage, plus a summary) or as a Prometheus textfile.
+    """
+
+    def __init__(self, script, fmt=METRICS_FORMAT, output=METRICS_OUTPUT):
+        self.script = script
+        self.fmt = fmt
+        self.output = output
+        self.stages = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.seconds = 0.0
+
+    def record(self, stage):
+        self.stages.append(stage)
+        if self.fmt == "json":
+            self._emit_json({"event": "stage", **stage.to_record()})
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._start
+        if self.fmt == "json":
+            self._emit_json({
+                "event": "run",
+                "seconds": round(self.seconds, 6),
+                "stages": len(self.stages),
+                "peak_rss_bytes": peak_rss_bytes(),
+            })
+        elif self.fmt == "prometheus":
+            self._write_prometheus()
+
+    def _emit_json(self, record):
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "script": self.script,
+            **record,
+        }
+        line = json.dumps(record)
+        if self.output:
+            with open(self.output, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+        else:
+            print(line, file=sys.stderr)
+
+    def _totals(self):
+        """
+        Sums stages that ran more than once (e.g. one fetch per URL) so each
+        stage name becomes a single Prometheus series.
+        """
+        totals = {}
+        for stage in self.stages:
+            total = totals.get(stage.name)
+            if total is None:
+                total = totals[stage.name] = Stage(stage.name, stage.unit)
+            total.seconds += stage.seconds
+            total.count += stage.count
+        return list(totals.values())
+
+    def _prometheus_lines(self):
+        script = self.script
+        stages = self._totals()
+        lines = [
+            "# HELP pipeline_stage_seconds Wall-clock time spent in a pipeline stage.",
+            "# TYPE pipeline_stage_seconds gauge",
+        ]
+        for stage in stages:
+            lines.append(f'pipeline_stage_seconds{{script="{script}",stage="{stage.name}"}} {stage.seconds:.6f}')
+
+        counted = [stage for stage in stages if stage.unit]
+        lines += [
+            "# HELP pipeline_stage_items Items (rows/files/URLs) handled by a pipeline stage.",
+            "# TYPE pipeline_stage_items gauge",
+        ]
+        for stage in counted:
+            lines.append(f'pipeline_stage_items{{script="{script}",stage="{stage.name}",unit="{stage.unit}"}} {stage.count}')
+        lines += [
+            "# HELP pipeline_stage_items_per_second Throughput of a pipeline stage.",
+            "# TYPE pipeline_stage_items_per_second gauge",
+        ]
+        for stage in counted:
+            rate = stage.rate or 0.0
+            lines.append(f'pipeline_stage_items_per_second{{script="{script}",stage="{stage.name}",unit="{stage.unit}"}} {rate:.3f}')
+
+        lines += [
+            "# HELP pipeline_run_seconds Wall-clock time of the whole run.",
+            "# TYPE pipeline_run_seconds gauge",
+            f'pipeline_run_seconds{{script="{script}"}} {self.seconds:.6f}',
+            "# HELP pipeline_last_run_timestamp_seconds Unix time the run started.",
+            "# TYPE pipeline_last_run_timestamp_seconds gauge",
+            f'pipeline_last_run_timestamp_seconds{{script="{script}"}} {self.started_at:.0f}',
+        ]
+        peak = peak_rss_bytes()
+        if peak is not None:
+            lines += [
+                "# HELP pipeline_peak_rss_bytes Peak resident set size of the process.",
+                "# TYPE pipeline_peak_rss_bytes gauge",
+                f'pipeline_peak_rss_bytes{{script="{script}"}} {peak}',
+            ]
+        return lines
+
+    def _write_prometheus(self):
+        path = self.output or f"{self.script}.prom"
+        if os.path.isdir(path):
+            path = os.path.join(path, f"{self.script}.prom")
+        # Write to a temp file and rename so the node_exporter textfile
+        # collector never reads a half-written file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self._prometheus_lines()) + "\n")
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def stage(name, unit=None):
+    """
+    Times a block of code as a named stage of the active run.
+    Outside of pipeline_run() the stage is still timed but not emitted.
+
+        with stage("scrape", unit="urls") as s:
+            for url in urls:
+                ...
+                s.add()
+    """
+    current = Stage(name, unit)
+    current.start()
+    try:
+        yield current
+    finally:
+        current.stop()
+        run = _active_run.get()
+        if run is not None:
+            run.record(current)
+
+
+@contextmanager
+def pipeline_run(script, enabled=True):
+    """
+    Wraps a whole script run: collects its stages, emits the run summary
+    and, if PIPELINE_PROFILE is set, profiles the run with cProfile.
+    With enabled=False nothing is recorded, emitted or profiled.
+    """
+    if not enabled:
+        yield None
+        return
+    if METRICS_FORMAT not in METRICS_FORMATS:
+        raise ValueError(f"Unknown PIPELINE_METRICS_FORMAT '{METRICS_FORMAT}', expected one of {', '.join(METRICS_FORMATS)}")
+
+    run = None
+    token = None
+    if METRICS_FORMAT != "off":
+        run = PipelineRun(script)
+        token = _active_run.set(run)
+
+    profiler = None
+    if PROFILE_OUTPUT:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield run
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(PROFILE_OUTPUT)
+        if run is not None:
+            _active_run.reset(token)
+            run.finish()
@@ -2,6 +2,7 @@ import pdfplumber
 import re
 import csv
 import os
+from instrumentation import pipeline_run, stage
 
 def parse_invoices(invoice_dir="invoices/", output_csv="invoice_report.csv"):
     """
@@ -24,47 +25,52 @@ def parse_invoices(invoice_dir="invoices/", output_csv="invoice_report.csv"):
     # Date: Looks for YYYY-MM-DD format
     date_pattern = re.compile(r'\d{4}-\d{2}-\d{2}')
 
-    for filename in os.listdir(invoice_dir):
-        if filename.lower().endswith(".pdf"):
-            filepath = os.path.join(invoice_dir, filename)
-            invoice_id = "N/A"
-            total_amount = "N/A"
-            invoice_date = "N/A"
+    with stage("parse_pdfs", unit="files") as s:
+        for filename in os.listdir(invoice_dir):
+            if filename.lower().endswith(".pdf"):
+                filepath = os.path.join(invoice_dir, filename)
+                invoice_id = "N/A"
+                total_amount = "N/A"
+                invoice_date = "N/A"
 
-            try:
-                with pdfplumber.open(filepath) as pdf:
-                    first_page = pdf.pages[0]
-                    text = first_page.extract_text()
+                try:
+                    with pdfplumber.open(filepath) as pdf:
+                        first_page = pdf.pages[0]
+                        text = first_page.extract_text()
 
-                    # Find Invoice ID
-                    id_match = invoice_id_pattern.search(text)
-                    if id_match:
-                        invoice_id = id_match.group(1)
+                        # Find Invoice ID
+                        id_match = invoice_id_pattern.search(text)
+                        if id_match:
+                            invoice_id = id_match.group(1)
 
-                    # Find Total Amount
-                    amount_match = amount_pattern.search(text)
-                    if amount_match:
-                        total_amount = amount_match.group(1)
+                        # Find Total Amount
+                        amount_match = amount_pattern.search(text)
+                        if amount_match:
+                            total_amount = amount_match.group(1)
 
-                    # Find Date
-                    date_match = date_pattern.search(text)
-                    if date_match:
-                        invoice_date = date_match.group(0)
+                        # Find Date
+                        date_match = date_pattern.search(text)
+                        if date_match:
+                            invoice_date = date_match.group(0)
 
-                    invoice_data.append([filename, invoice_id, invoice_date, total_amount])
-                    print(f"Processed {filename}: ID={invoice_id}, Date={invoice_date}, Amount=${total_amount}")
+                        invoice_data.append([filename, invoice_id, invoice_date, total_amount])
+                        print(f"Processed {filename}: ID={invoice_id}, Date={invoice_date}, Amount=${total_amount}")
 
-            except Exception as e:
-                print(f"Oopsie! Could not process {filename}: {e}")
+                except Exception as e:
+                    print(f"Oopsie! Could not process {filename}: {e}")
+                s.add()
 
     # Write to CSV
     try:
-        with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
+        with stage("write_csv", unit="rows") as s, \
+                open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
             csv_writer = csv.writer(csvfile)
             csv_writer.writerows(invoice_data)
+            s.add(len(invoice_data) - 1)
         print(f"All done! Invoice data saved to {output_csv}")
     except Exception as e:
         print(f"Bark! Could not write to CSV file {output_csv}: {e}")
 
 if __name__ == "__main__":
-    parse_invoices()
+    with pipeline_run("invoice_parser"):
+        parse_invoices()
@@ -1,6 +1,5 @@
 import streamlit as st
-from PIL import Image
-import os
+from image_assets import get_display_image, placeholder_image
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -9,7 +8,16 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- HELPER FUNCTION FOR PROJECT PAGES ---
+# --- HELPER FUNCTIONS FOR PROJECT PAGES ---
+def show_snapshot(project_name, label, image_path, max_width):
+    image = get_display_image(image_path, max_width)
+    if image is not None:
+        st.image(image, caption=f"{project_name} - {label}", width=max_width)
+    else:
+        # Placeholder keeps the 1050x600 aspect ratio of the original remote one
+        st.warning(f"{label} image not found for {project_name} at `{image_path}`. Using a placeholder.")
+        st.image(placeholder_image(max_width, round(max_width * 4 / 7), f"{label} Image Coming Soon"), caption=f"Placeholder {label} Image", width=max_width)
+
 def show_project_page(project_name, problem_text, solution_text, mock_code, max_width=1050):
     st.title(f"✨ {project_name}")
     st.write("---")
@@ -29,18 +37,10 @@ def show_project_page(project_name, problem_text, solution_text, mock_code, max_
     col_before, col_after = st.columns(2)
 
     with col_before:
-        if os.path.exists(before_image_path):
-            st.image(before_image_path, caption=f"{project_name} - Before", width=max_width)
-        else:
-            st.warning(f"Before image not found for {project_name} at `{before_image_path}`. Using a placeholder.")
-            st.image("https://via.placeholder.com/1050x600.png?text=Before+Image+Coming+Soon", caption="Placeholder Before Image", width=max_width)
+        show_snapshot(project_name, "Before", before_image_path, max_width)
 
     with col_after:
-        if os.path.exists(after_image_path):
-            st.image(after_image_path, caption=f"{project_name} - After", width=max_width)
-        else:
-            st.warning(f"After image not found for {project_name} at `{after_image_path}`. Using a placeholder.")
-            st.image("https://via.placeholder.com/1050x600.png?text=After+Image+Coming+Soon", caption="Placeholder After Image", width=max_width)
+        show_snapshot(project_name, "After", after_image_path, max_width)
 
     st.subheader("💻 Code Highlight")
     st.code(mock_code, language="python")
@@ -58,7 +58,7 @@ st.sidebar.info("Developed with ❤️ by your AI Agentic Developer!")
 
 # --- MAIN PAGE CONTENT ---
 if selection == "Home":
-    st.image("https://via.placeholder.com/150.png?text=Your+Profile+Pic", width=150)
+    st.image(placeholder_image(150, 150, "Your Profile Pic"), width=150)
     st.title("🌟 Ryan - AI Agentic Developer & Supply Chain Analyst")
     st.markdown("### I build automated data solutions using Python, SQL, and AI Agents.")
     st.write("---")
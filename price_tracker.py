@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 import csv
 from datetime import datetime
 import time
+from instrumentation import pipeline_run, stage
 
 BOOK_URLS = [
     "http://books.toscrape.com/catalogue/a-light-in-the-attic_1000/index.html",
@@ -33,9 +34,11 @@ def append_to_csv(data, file_path="price_history.csv"):
     Appends a new row of data to the CSV file.
     """
     try:
-        with open(file_path, 'a', newline='', encoding='utf-8') as f:
+        with stage("append_csv", unit="rows") as s, \
+                open(file_path, 'a', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
             writer.writerow(data)
+            s.add()
             print(f"Appended data for '{data.get("Title", "N/A")}' to '{file_path}'.")
     except IOError as e:
         print(f"Error appending data to '{file_path}': {e}")
@@ -47,13 +50,17 @@ def scrape_book_data(url):
     """
     print(f"Attempting to scrape: {url}")
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+        with stage("fetch_page", unit="urls") as s:
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+            s.add()
     except requests.exceptions.RequestException as e:
         print(f"Error fetching the page {url}: {e}")
         return None
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    with stage("parse_html", unit="pages") as s:
+        soup = BeautifulSoup(response.text, 'html.parser')
+        s.add()
 
     scraped_data = {"Title": "N/A", "Price": "N/A", "Availability": "N/A", "URL": url}
 
@@ -92,13 +99,17 @@ def track_prices():
     """
     ensure_csv_headers()
 
-    for url in BOOK_URLS:
-        scraped_data = scrape_book_data(url)
-        if scraped_data:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            scraped_data["Timestamp"] = timestamp
-            append_to_csv(scraped_data)
-        time.sleep(1)  # Be polite and wait 1 second between requests
+    # Wall-clock time only: it includes the politeness delay, so throughput is
+    # reported by the fetch_page and parse_html stages instead
+    with stage("track_prices"):
+        for url in BOOK_URLS:
+            scraped_data = scrape_book_data(url)
+            if scraped_data:
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                scraped_data["Timestamp"] = timestamp
+                append_to_csv(scraped_data)
+            time.sleep(1)  # Be polite and wait 1 second between requests
 
 if __name__ == "__main__":
-    track_prices()
+    with pipeline_run("price_tracker"):
+        track_prices()
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Measures cold-start cost of the Streamlit apps. Every case runs in a fresh
+# Python process so nothing is already sitting in sys.modules:
+#   import_seconds        time to import streamlit and its test harness
+#   first_render_seconds  first run of the app script (its default page)
+#   page_render_seconds   warm switch to the requested page: streamlit, the
+#                         default page's modules and the DB engine are already
+#                         loaded, so this is not a cold first render
+# It also reports which heavy modules the first render loaded, and which ones
+# the page switch added on top (page_loaded_modules), so a page that starts
+# importing something it doesn't need shows up here. A case whose app shows an
+# error or raises fails the benchmark, since its timings would only measure the
+# error path.
+#
+#   python startup_benchmark.py --db path/to/retail.db --target 3.0
+#   python startup_benchmark.py --db path/to/retail.db --app dashboard.py --page "Scenario Planner"
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY_MODULES = ["pandas", "sqlalchemy", "altair", "openpyxl", "PIL"]
+
+CASES = [
+    ("portfolio_app.py", None),
+    ("portfolio_app.py", "Retail Pulse"),
+    ("dashboard.py", None),
+    ("dashboard.py", "Risk Alerts"),
+    ("dashboard.py", "Scenario Planner"),
+]
+
+_CHILD_CODE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+import_seconds = time.perf_counter() - start
+
+app, page, heavy_modules = sys.argv[1], sys.argv[2] or None, sys.argv[3].split(",")
+at = AppTest.from_file(app, default_timeout=120)
+start = time.perf_counter()
+at.run()
+first_render_seconds = time.perf_counter() - start
+
+loaded_modules = [m for m in heavy_modules if m in sys.modules]
+
+page_render_seconds = None
+page_loaded_modules = None
+if page:
+    before_page = set(sys.modules)
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    page_render_seconds = time.perf_counter() - start
+    page_loaded_modules = [m for m in heavy_modules if m in sys.modules and m not in before_page]
+
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "first_render_seconds": first_render_seconds,
+    "page_render_seconds": page_render_seconds,
+    "loaded_modules": loaded_modules,
+    "page_loaded_modules": page_loaded_modules,
+    "errors": [str(e.value) for e in at.error] + [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def run_case(app, page, db_path=None):
+    """
+    Runs one app/page combination in a fresh interpreter and returns its timings.
+    """
+    env = dict(os.environ)
+    if db_path:
+        env["RETAIL_DB_PATH"] = os.path.abspath(db_path)
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD_CODE, app, page or "", ",".join(HEAVY_MODULES)],
+        cwd=APP_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Benchmark of {app} failed:\n{result.stderr}")
+    # The apps print their own progress, so the timings are the last line
+    record = json.loads(result.stdout.strip().splitlines()[-1])
+    record["app"] = app
+    record["page"] = page or "(default)"
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start of the Streamlit apps.")
+    parser.add_argument("--app", help="Only benchmark this app script")
+    parser.add_argument("--page", help="Sidebar page to switch to after the first render (with --app); "
+                                       "its timing is a warm switch, not a cold first render")
+    parser.add_argument("--target", type=float, help="Fail if import + render time exceeds this many seconds")
+    parser.add_argument("--json", action="store_true", help="Print one JSON line per case instead of a table")
+    parser.add_argument("--db", help="SQLite database for dashboard.py (sets RETAIL_DB_PATH)")
+    args = parser.parse_args()
+    if args.page and not args.app:
+        parser.error("--page requires --app")
+
+    cases = CASES
+    if args.app:
+        cases = [(args.app, args.page)]
+
+    over_target = []
+    failed = []
+    if not args.json:
+        print(f"{'App':<18} {'Page':<18} {'Import':>8} {'Render':>8} {'Page':>8}  Loaded / page adds")
+    for app, page in cases:
+        record = run_case(app, page, args.db)
+        if record["errors"]:
+            failed.append(record)
+        total = record["import_seconds"] + record["first_render_seconds"] + (record["page_render_seconds"] or 0.0)
+        record["total_seconds"] = total
+        if args.target is not None and total > args.target:
+            over_target.append(record)
+
+        if args.json:
+            print(json.dumps(record))
+        else:
+            page_render = "-"
+            loaded = ", ".join(record["loaded_modules"]) or "-"
+            if record["page_render_seconds"] is not None:
+                page_render = f"{record['page_render_seconds']:.2f}s"
+                loaded += f" / {', '.join(record['page_loaded_modules']) or '-'}"
+            print(f"{record['app']:<18} {record['page']:<18} {record['import_seconds']:>7.2f}s "
+                  f"{record['first_render_seconds']:>7.2f}s {page_render:>8}  {loaded}")
+        for error in record["errors"]:
+            print(f"  ! {app} showed an error: {error}", file=sys.stderr)
+
+    for record in failed:
+        print(f"{record['app']} / {record['page']} did not render cleanly, its timings are not valid "
+              f"(for dashboard.py pass --db or set RETAIL_DB_PATH)", file=sys.stderr)
+    for record in over_target:
+        print(f"Cold start over target for {record['app']} / {record['page']}: "
+              f"{record['total_seconds']:.2f}s > {args.target:.2f}s", file=sys.stderr)
+    if failed or over_target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()